@@ -9,12 +9,15 @@ import numpy as np
 import sys
 import os
 import random
+import queue
 
 # Add the project root directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.gesture.detector import GestureDetector
+from src.gesture.worker import GestureWorker
 from src.game.snake import SnakeGame
+from src.camera.capture import CameraThread
 
 # Add sound directory
 SOUND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
@@ -40,7 +43,23 @@ def main():
     # Initialize display
     pygame.init()
     pygame.mixer.init()  # Initialize sound mixer
-    screen = pygame.display.set_mode((window_width, window_height))
+    # pygame 2 only honours vsync together with SCALED or OPENGL. SCALED also enlarges
+    # the window by the largest integer factor that fits the desktop, so only use it
+    # when that factor is 1 (desktop smaller than twice the window in some dimension)
+    desktop_width, desktop_height = pygame.display.get_desktop_sizes()[0]
+    screen = None
+    if desktop_width < window_width * 2 or desktop_height < window_height * 2:
+        try:
+            # Let vsync pace presented frames
+            screen = pygame.display.set_mode(
+                (window_width, window_height),
+                pygame.SCALED | pygame.DOUBLEBUF,
+                vsync=1
+            )
+        except pygame.error:
+            pass
+    if screen is None:
+        screen = pygame.display.set_mode((window_width, window_height))
     pygame.display.set_caption("Gesture Controlled Snake Game")
     
     # Load sounds
@@ -76,15 +95,15 @@ def main():
         print(f"Error loading sounds: {e}")
         # Continue without sounds if there's an error
     
-    # Initialize camera
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
+    # Initialize camera, feeding frames to the gesture worker through a single-slot queue
+    frame_queue = queue.Queue(maxsize=1)
+    camera = CameraThread(0, frame_queue)
+    if not camera.is_opened():
         print("Error: Cannot open camera")
         return
     
     # Get original camera resolution
-    original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    original_width, original_height = camera.get_resolution()
     
     # Calculate video size maintaining original aspect ratio
     video_width = game_width
@@ -99,27 +118,62 @@ def main():
     video_x = (game_width - video_width) // 2
     video_y = (window_height - video_height) // 2
     
+    # Preallocate the video buffer and wrap it in a surface that shares its memory,
+    # so resizing a frame into the buffer updates the surface in place
+    frame_resized = np.zeros((video_height, video_width, 3), np.uint8)
+    video_surface = pygame.image.frombuffer(frame_resized, (video_width, video_height), 'BGR')
+    
+    # Render help text once, it never changes
+    help_font = pygame.font.SysFont('Arial', 20)
+    help_texts = [
+        "Controls:",
+        "- Use thumb and index finger to control direction",
+        "- P key: Pause/Resume game",
+        "- R key: Restart game when game over",
+        "- G key: Show/Hide grid",
+        "- W key: Enable/Disable wall collision",
+        "- H key: Show/Hide help",
+        "- M key: Toggle music",
+        "- +/- keys: Increase/Decrease game speed",
+        "- ESC key: Exit game"
+    ]
+    help_surfaces = [help_font.render(text, True, (200, 200, 200)) for text in help_texts]
+    
     # Initialize clock and frame rate
     clock = pygame.time.Clock()
-    base_fps = 30  # Higher base frame rate for smoother video
+    max_fps = snake_game.frame_rate  # Loop rate the snake's move_delay is tuned for, matching the camera's 30 FPS
+    elapsed = 0.0  # Seconds taken by the previous loop iteration
     running = True
     
     # Control variables
     show_help = True
-    help_timeout = 300  # Number of frames to show help
-    frame_count = 0
+    help_timeout = 10000  # Milliseconds to show help
+    start_ticks = pygame.time.get_ticks()
     
+    # Screen regions, redrawn only when their content changes
+    video_area = pygame.Rect(0, 0, game_width, window_height)
+    game_area = pygame.Rect(game_width, 0, game_width, game_height)
+    full_redraw = True  # Draw everything on the first frame
+    help_visible = None
+
     # Game state tracking for sound effects
     previous_score = 0
     previous_direction = None
     previous_game_over = False
     
+    # Start capturing frames and detecting gestures in the background
+    gesture_worker = GestureWorker(gesture_detector, frame_queue)
+    gesture_worker.start()
+    camera.start()
+    
     try:
         while running:
             # Process events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    full_redraw = True
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r and snake_game.game_over:
                         snake_game.reset()
@@ -133,10 +187,10 @@ def main():
                         show_help = not show_help
                     elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
                         # Increase game speed
-                        snake_game.speed = min(snake_game.speed + 0.1, 2.0)
+                        snake_game.change_speed(0.1)
                     elif event.key == pygame.K_MINUS:
                         # Decrease game speed
-                        snake_game.speed = max(snake_game.speed - 0.1, 0.1)
+                        snake_game.change_speed(-0.1)
                     elif event.key == pygame.K_ESCAPE:
                         running = False
                     elif event.key == pygame.K_m:
@@ -147,17 +201,18 @@ def main():
                             else:
                                 pygame.mixer.unpause()
             
-            # Capture video frame
-            ret, frame = cap.read()
-            if not ret:
+            # Stop if the camera thread could not read a frame
+            if camera.failed:
                 print("Error: Cannot read camera frame")
                 break
-                
-            # Flip horizontally to create mirror effect
-            frame = cv2.flip(frame, 1)
             
-            # Detect gesture and get direction
-            direction = gesture_detector.detect_direction(frame)
+            # Stop if the gesture worker hit an error
+            if gesture_worker.failed:
+                print("Error: Gesture detection stopped")
+                break
+            
+            # Read the latest detected direction without waiting for inference
+            direction = gesture_worker.latest_direction
             if direction:
                 # Play turn sound if direction changed
                 if direction != previous_direction and "turn" in sounds:
@@ -165,70 +220,67 @@ def main():
                 previous_direction = direction
                 snake_game.change_direction(direction)
             
-            # Update game state
-            snake_game.update()
-            
-            # Play sound effects based on game state changes
-            if snake_game.score > previous_score:
-                if "eat" in sounds:
-                    sounds["eat"].play()
-                previous_score = snake_game.score
+            # Get the newest annotated frame, if one was processed since the last iteration
+            frame = gesture_worker.read_latest()
+            video_dirty = full_redraw
+            if frame is not None:
+                # Resize into the buffer backing the video surface, maintaining aspect ratio
+                cv2.resize(frame, (video_width, video_height), dst=frame_resized, interpolation=cv2.INTER_LINEAR)
+                video_dirty = True
             
-            if snake_game.game_over and not previous_game_over:
-                if "game_over" in sounds:
-                    sounds["game_over"].play()
-                previous_game_over = True
-            elif not snake_game.game_over and previous_game_over:
-                previous_game_over = False
+            # Help overlay sits on top of the video, so showing or hiding it redraws the video
+            show_help_now = show_help or pygame.time.get_ticks() - start_ticks < help_timeout
+            if show_help_now != help_visible:
+                help_visible = show_help_now
+                video_dirty = True
             
-            # Convert OpenCV image format to Pygame format, maintaining aspect ratio
-            frame_resized = cv2.resize(frame, (video_width, video_height))
-            frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-            video_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            
-            # Get game screen
-            game_surface = snake_game.render()
+            # Update game state, score and game over only change when the snake moved
+            if snake_game.update(elapsed):
+                # Play sound effects based on game state changes
+                if snake_game.score > previous_score:
+                    if "eat" in sounds:
+                        sounds["eat"].play()
+                    previous_score = snake_game.score
+                
+                if snake_game.game_over and not previous_game_over:
+                    if "game_over" in sounds:
+                        sounds["game_over"].play()
+                    previous_game_over = True
+                elif not snake_game.game_over and previous_game_over:
+                    previous_game_over = False
             
-            # Fill background
-            screen.fill((0, 0, 0))
+            dirty_rects = []
             
             # Display video part (left)
-            screen.blit(video_surface, (video_x, video_y))
-            
-            # Display game part (right)
-            screen.blit(game_surface, (game_width, 0))
-            
-            # Add dividing line
-            pygame.draw.line(screen, (255, 255, 255), (game_width, 0), (game_width, window_height), 2)
-            
-            # Show help information
-            if show_help or frame_count < help_timeout:
-                help_font = pygame.font.SysFont('Arial', 20)
-                help_texts = [
-                    "Controls:",
-                    "- Use thumb and index finger to control direction",
-                    "- P key: Pause/Resume game",
-                    "- R key: Restart game when game over",
-                    "- G key: Show/Hide grid",
-                    "- W key: Enable/Disable wall collision",
-                    "- H key: Show/Hide help",
-                    "- M key: Toggle music",
-                    "- +/- keys: Increase/Decrease game speed",
-                    "- ESC key: Exit game"
-                ]
+            if video_dirty:
+                screen.fill((0, 0, 0), video_area)
+                screen.blit(video_surface, (video_x, video_y))
+                
+                # Show help information
+                if help_visible:
+                    for i, help_surface in enumerate(help_surfaces):
+                        screen.blit(help_surface, (video_x + 10, video_y + video_height - 240 + i * 25))
                 
-                for i, text in enumerate(help_texts):
-                    help_surface = help_font.render(text, True, (200, 200, 200))
-                    screen.blit(help_surface, (video_x + 10, video_y + video_height - 240 + i * 25))
+                dirty_rects.append(video_area)
             
-            # Update display
-            pygame.display.flip()
+            # Display game part (right), rendering only when the game state changed
+            if snake_game.dirty or full_redraw:
+                game_surface = snake_game.render()
+                screen.blit(game_surface, game_area)
+                dirty_rects.append(game_area)
             
-            # Control frame rate
-            clock.tick(base_fps)
+            # Update display
+            if dirty_rects:
+                # Add dividing line, which overlaps both parts
+                dirty_rects.append(
+                    pygame.draw.line(screen, (255, 255, 255), (game_width, 0), (game_width, window_height), 2)
+                )
+                pygame.display.update(dirty_rects)
+            full_redraw = False
             
-            # Update frame count
-            frame_count += 1
+            # Cap the loop at the camera's 30 FPS with a sleeping (non-busy) wait; the measured
+            # frame time drives the time-based snake speed
+            elapsed = clock.tick(max_fps) / 1000.0
     
     except KeyboardInterrupt:
         print("Game interrupted by user")
@@ -240,7 +292,8 @@ def main():
         # Clean up resources
         if "background" in sounds:
             sounds["background"].stop()
-        cap.release()
+        camera.release()
+        gesture_worker.release()
         gesture_detector.release()
         pygame.quit()
         print("Game exited")
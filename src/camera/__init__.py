@@ -0,0 +1,3 @@
+"""
+Camera module for threaded video capture
+""" 
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Camera capture module - Reads webcam frames on a background thread
+"""
+
+import queue
+import threading
+
+import cv2
+
+
+class CameraThread(threading.Thread):
+    """
+    Background camera reader that keeps only the latest frame
+    """
+    def __init__(self, camera_index, frame_queue):
+        """
+        Open the camera and configure it for low latency capture
+
+        Args:
+            camera_index (int): Index of the camera device to open
+            frame_queue (queue.Queue): Bounded queue that receives captured frames,
+                dropping the oldest one when full
+        """
+        super().__init__(daemon=True)
+
+        self.cap = cv2.VideoCapture(camera_index)
+
+        # Output queue, shared with the consumer thread
+        self.frame_queue = frame_queue
+
+        # Capture state
+        self.running = False
+        self.failed = False
+
+        if not self.cap.isOpened():
+            return
+
+        # Keep only the newest frame in the driver buffer to reduce gesture latency
+        if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("Warning: Camera backend does not support setting buffer size")
+
+        # Request MJPG at 30 FPS for cheaper decoding on USB webcams
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        self.cap.set(cv2.CAP_PROP_FPS, 30)
+
+    def is_opened(self):
+        """
+        Check whether the camera was opened successfully
+
+        Returns:
+            bool: True if the camera is available
+        """
+        return self.cap.isOpened()
+
+    def get_resolution(self):
+        """
+        Get camera frame resolution
+
+        Returns:
+            tuple: (width, height) of captured frames
+        """
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return width, height
+
+    def start(self):
+        """
+        Start capturing frames in the background
+        """
+        self.running = True
+        super().start()
+
+    def run(self):
+        """
+        Capture loop - continuously replaces the queued frame with the newest one
+        """
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                self.failed = True
+                self.running = False
+                break
+
+            self._put_latest(frame)
+
+    def _put_latest(self, frame):
+        """
+        Put a frame on the output queue, replacing a frame nobody picked up
+
+        Args:
+            frame (numpy.ndarray): Captured frame
+        """
+        try:
+            self.frame_queue.put_nowait(frame)
+        except queue.Full:
+            try:
+                self.frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.frame_queue.put_nowait(frame)
+
+    def release(self):
+        """
+        Stop the capture thread and release the camera
+        """
+        self.running = False
+        if self.is_alive():
+            self.join(timeout=1.0)
+        self.cap.release()
@@ -5,6 +5,7 @@ Snake game module - Implements the classic Snake game logic
 import pygame
 import random
 import numpy as np
+from collections import OrderedDict
 
 
 class SnakeGame:
@@ -25,8 +26,13 @@ class SnakeGame:
         # Adjust cell size based on game area dimensions
         self.cell_size = max(20, min(30, width // 30, height // 30))
         
-        # Initialize snake
-        self.snake = [(width // 2, height // 2)]
+        # Grid dimensions in cells
+        self.cols = width // self.cell_size
+        self.rows = height // self.cell_size
+        
+        # Initialize snake at the grid cell nearest the center
+        self._init_body(self._start_position())
+        self._init_free_cells()
         self.length = 1
         
         # Initialize direction (x, y)
@@ -60,6 +66,10 @@ class SnakeGame:
         self.font = pygame.font.SysFont('Arial', 24)
         self.large_font = pygame.font.SysFont('Arial', 48)
         
+        # Rendered text cache - (text, font id) -> Surface, least recently used first
+        self._text_cache = OrderedDict()
+        self._text_cache_size = 64
+        
         # Game speed (pixels moved per update) - lower initial speed
         self.speed = 0.5
         
@@ -69,12 +79,132 @@ class SnakeGame:
         # Movement timer - controls snake movement frequency
         self.move_timer = 0
         self.move_delay = 5  # Move every N frames
+        self.frame_rate = 30  # Frame rate move_delay is measured at, also the main loop cap (camera FPS)
         
         # Game mode
         self.wall_collision = True  # Whether wall collision is enabled
         
         # Food proximity threshold (in cells)
         self.food_proximity = 1  # How close the snake needs to be to eat food
+        
+        # Static background (fill, grid and border), redrawn only when toggled
+        self._bg = pygame.Surface((width, height))
+        self._rebuild_background()
+        
+        # Pre-drawn snake segment tiles, stamped with a single blits() call
+        self._build_tiles()
+        
+        # Whether the game surface needs to be rendered again
+        self.dirty = True
+        
+        # HUD labels, redrawn into their own surface only when a value changes
+        self._hud_surf = pygame.Surface((width, 100), pygame.SRCALPHA)
+        self._hud_prev = {"score": None, "speed": None, "wall": None}
+    
+    def _start_position(self):
+        """
+        Get the grid-aligned starting position of the snake
+
+        Returns:
+            tuple: (x, y) coordinates of the center grid cell
+        """
+        return (self.cols // 2 * self.cell_size, self.rows // 2 * self.cell_size)
+    
+    def _init_body(self, head):
+        """
+        Create a one-segment snake in a circular buffer of segment positions
+
+        Args:
+            head (tuple): (x, y) coordinates of the initial segment
+        """
+        # Segments live in a preallocated (capacity, 2) int16 array, head first;
+        # moving the snake only shifts the head index and length. Segments are
+        # distinct grid cells, so the snake never outgrows one slot per cell
+        self._body = np.empty((max(1, self.cols * self.rows), 2), np.int16)
+        self._body[0] = head
+        self._head_idx = 0
+        self._len = 1
+        self._snake_set = {head}  # Segment positions for O(1) membership tests
+    
+    def _segments(self):
+        """
+        Get snake segment positions ordered from head to tail
+
+        Returns:
+            numpy.ndarray: (length, 2) array of segment coordinates
+        """
+        end = self._head_idx + self._len
+        if end <= len(self._body):
+            return self._body[self._head_idx:end]
+        return np.concatenate((self._body[self._head_idx:], self._body[:end - len(self._body)]))
+    
+    def _push_head(self, pos):
+        """
+        Add a new head segment
+
+        Args:
+            pos (tuple): (x, y) coordinates of the new head
+        """
+        self._head_idx = (self._head_idx - 1) % len(self._body)
+        self._body[self._head_idx] = pos
+        self._len += 1
+        self._occupy(pos)
+    
+    def _pop_tail(self):
+        """
+        Remove the tail segment
+        """
+        tail_idx = (self._head_idx + self._len - 1) % len(self._body)
+        self._len -= 1
+        self._vacate(tuple(self._body[tail_idx].tolist()))
+    
+    @property
+    def snake(self):
+        """
+        list: (x, y) segment coordinates ordered from head to tail
+        """
+        return [tuple(segment) for segment in self._segments().tolist()]
+    
+    def _init_free_cells(self):
+        """
+        Build the list of grid cells not covered by the snake
+        """
+        # Free cells list for O(1) random choice, plus each cell's index for O(1) removal
+        self._free_cells = [
+            (x * self.cell_size, y * self.cell_size)
+            for x in range(self.cols)
+            for y in range(self.rows)
+            if (x * self.cell_size, y * self.cell_size) not in self._snake_set
+        ]
+        self._free_index = {cell: i for i, cell in enumerate(self._free_cells)}
+    
+    def _occupy(self, pos):
+        """
+        Mark a position as covered by the snake
+
+        Args:
+            pos (tuple): (x, y) segment coordinates
+        """
+        self._snake_set.add(pos)
+        
+        # Swap-remove the cell from the free list
+        i = self._free_index.pop(pos, None)
+        if i is not None:
+            last = self._free_cells.pop()
+            if last != pos:
+                self._free_cells[i] = last
+                self._free_index[last] = i
+    
+    def _vacate(self, pos):
+        """
+        Mark a position as no longer covered by the snake
+
+        Args:
+            pos (tuple): (x, y) segment coordinates
+        """
+        self._snake_set.discard(pos)
+        self._free_index[pos] = len(self._free_cells)
+        self._free_cells.append(pos)
     
     def _generate_food(self):
         """
@@ -83,13 +213,34 @@ class SnakeGame:
         Returns:
             tuple: (x, y) food coordinates
         """
-        while True:
-            x = random.randint(0, (self.width // self.cell_size) - 1) * self.cell_size
-            y = random.randint(0, (self.height // self.cell_size) - 1) * self.cell_size
-            food_pos = (x, y)
-            
-            if food_pos not in self.snake:
-                return food_pos
+        # If the snake covers the whole board there is nowhere left to place food
+        if not self._free_cells:
+            self.game_over = True
+            return self.food
+        
+        return random.choice(self._free_cells)
+    
+    def _text(self, text, font):
+        """
+        Render text, reusing a cached surface when the same text was rendered before
+
+        Args:
+            text (str): Text to render
+            font (pygame.font.Font): Font to render with
+
+        Returns:
+            pygame.Surface: Rendered text surface
+        """
+        key = (text, id(font))
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, self.colors["text"])
+            self._text_cache[key] = surface
+            if len(self._text_cache) > self._text_cache_size:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return surface
     
     def change_direction(self, direction_name):
         """
@@ -118,18 +269,39 @@ class SnakeGame:
         Toggle wall collision mode
         """
         self.wall_collision = not self.wall_collision
+        self._rebuild_background()
+        self.dirty = True
     
-    def update(self):
+    def change_speed(self, delta):
+        """
+        Change game speed, keeping it within the allowed range
+
+        Args:
+            delta (float): Amount to add to the current speed
+        """
+        self.speed = max(0.1, min(self.speed + delta, 2.0))
+        self.dirty = True
+    
+    def update(self, dt=None):
         """
         Update game state
+
+        Args:
+            dt (float): Seconds since the last update, or None to advance by one frame
+
+        Returns:
+            bool: True if the visible game state changed
         """
         if self.game_over or self.paused:
-            return
+            return False
         
         # Use movement timer to control snake movement frequency
-        self.move_timer += 1
+        self.move_timer += 1 if dt is None else dt * self.frame_rate
         if self.move_timer < self.move_delay / self.speed:
-            return
+            return False
+        
+        # The snake either moves or collides, both change the screen
+        self.dirty = True
         
         # Reset timer
         self.move_timer = 0
@@ -138,33 +310,33 @@ class SnakeGame:
         self.direction = self.next_direction
         
         # Calculate new head position
-        head_x, head_y = self.snake[0]
+        head_x, head_y = self._body[self._head_idx].tolist()
         dir_x, dir_y = self.direction
         new_head_x = head_x + dir_x * self.cell_size
         new_head_y = head_y + dir_y * self.cell_size
         
         # Check for wall collision
         if self.wall_collision:
-            if (new_head_x < 0 or new_head_x >= self.width or
-                new_head_y < 0 or new_head_y >= self.height):
+            if (new_head_x < 0 or new_head_x >= self.cols * self.cell_size or
+                new_head_y < 0 or new_head_y >= self.rows * self.cell_size):
                 self.game_over = True
-                return
+                return True
             
             new_head = (new_head_x, new_head_y)
         else:
-            # If wall collision is disabled, wrap around boundaries
+            # If wall collision is disabled, wrap around the grid so the snake stays cell aligned
             new_head = (
-                new_head_x % self.width,
-                new_head_y % self.height
+                new_head_x % (self.cols * self.cell_size),
+                new_head_y % (self.rows * self.cell_size)
             )
         
         # Check for self collision
-        if new_head in self.snake:
+        if new_head in self._snake_set:
             self.game_over = True
-            return
+            return True
         
         # Move snake
-        self.snake.insert(0, new_head)
+        self._push_head(new_head)
         
         # Check if food is eaten - with proximity detection
         food_eaten = False
@@ -186,63 +358,102 @@ class SnakeGame:
         
         # If food wasn't eaten, remove tail
         if not food_eaten:
-            self.snake.pop()
+            self._pop_tail()
+        
+        return True
     
     def toggle_pause(self):
         """
         Toggle game pause state
         """
         self.paused = not self.paused
+        self.dirty = True
     
     def toggle_grid(self):
         """
         Toggle grid display
         """
         self.show_grid = not self.show_grid
+        self._rebuild_background()
+        self.dirty = True
     
-    def render(self):
+    def _rebuild_background(self):
         """
-        Render game screen
-
-        Returns:
-            pygame.Surface: Rendered game surface
+        Draw the static background, grid and border into the background surface
         """
         # Fill background
-        self.surface.fill(self.colors["background"])
+        self._bg.fill(self.colors["background"])
         
         # Draw grid
         if self.show_grid:
             for x in range(0, self.width, self.cell_size):
-                pygame.draw.line(self.surface, self.colors["grid"], (x, 0), (x, self.height))
+                pygame.draw.line(self._bg, self.colors["grid"], (x, 0), (x, self.height))
             for y in range(0, self.height, self.cell_size):
-                pygame.draw.line(self.surface, self.colors["grid"], (0, y), (self.width, y))
+                pygame.draw.line(self._bg, self.colors["grid"], (0, y), (self.width, y))
         
-        # Draw border
+        # Draw border around the playable grid
         if self.wall_collision:
             border_width = 3
             pygame.draw.rect(
-                self.surface,
+                self._bg,
                 self.colors["border"],
-                pygame.Rect(0, 0, self.width, self.height),
+                pygame.Rect(0, 0, self.cols * self.cell_size, self.rows * self.cell_size),
                 border_width
             )
+    
+    def _build_tiles(self):
+        """
+        Draw the snake head and body tiles for the current cell size
+        """
+        self._head_tile = pygame.Surface((self.cell_size, self.cell_size))
+        self._body_tile = pygame.Surface((self.cell_size, self.cell_size))
         
-        # Draw snake
-        for i, segment in enumerate(self.snake):
-            color = self.colors["snake_head"] if i == 0 else self.colors["snake_body"]
-            pygame.draw.rect(
-                self.surface, 
-                color,
-                pygame.Rect(segment[0], segment[1], self.cell_size, self.cell_size)
-            )
+        for tile, color in ((self._head_tile, self.colors["snake_head"]),
+                            (self._body_tile, self.colors["snake_body"])):
+            tile.fill(color)
             
             # Draw border on snake segments for better visibility
             pygame.draw.rect(
-                self.surface,
+                tile,
                 (0, 100, 0),
-                pygame.Rect(segment[0], segment[1], self.cell_size, self.cell_size),
+                pygame.Rect(0, 0, self.cell_size, self.cell_size),
                 1
             )
+    
+    def _update_hud(self):
+        """
+        Redraw the HUD surface if the score, speed or wall collision mode changed
+        """
+        hud = {
+            "score": f'Score: {self.score}',
+            "speed": f'Speed: {self.speed:.1f}x',
+            "wall": f'Wall Collision: {"On" if self.wall_collision else "Off"}'
+        }
+        if hud == self._hud_prev:
+            return
+        
+        self._hud_prev = hud
+        self._hud_surf.fill((0, 0, 0, 0))
+        self._hud_surf.blit(self._text(hud["score"], self.font), (10, 10))
+        self._hud_surf.blit(self._text(hud["speed"], self.font), (10, 40))
+        self._hud_surf.blit(self._text(hud["wall"], self.font), (10, 70))
+    
+    def render(self):
+        """
+        Render game screen
+
+        Returns:
+            pygame.Surface: Rendered game surface
+        """
+        self.dirty = False
+        
+        # Draw static background, grid and border
+        self.surface.blit(self._bg, (0, 0))
+        
+        # Draw snake body in one call, then the head on top
+        segments = self._segments().tolist()
+        self.surface.blits([(self._body_tile, segment) for segment in segments[1:]], doreturn=False)
+        self.surface.blit(self._head_tile, segments[0])
         
         # Draw food
         pygame.draw.rect(
@@ -251,39 +462,27 @@ class SnakeGame:
             pygame.Rect(self.food[0], self.food[1], self.cell_size, self.cell_size)
         )
         
-        # Draw score
-        score_text = self.font.render(f'Score: {self.score}', True, self.colors["text"])
-        self.surface.blit(score_text, (10, 10))
-        
-        # Draw speed
-        speed_text = self.font.render(f'Speed: {self.speed:.1f}x', True, self.colors["text"])
-        self.surface.blit(speed_text, (10, 40))
-        
-        # Draw wall collision mode
-        wall_text = self.font.render(
-            f'Wall Collision: {"On" if self.wall_collision else "Off"}', 
-            True, 
-            self.colors["text"]
-        )
-        self.surface.blit(wall_text, (10, 70))
+        # Draw score, speed and wall collision mode
+        self._update_hud()
+        self.surface.blit(self._hud_surf, (0, 0))
         
         # If game is paused, show pause information
         if self.paused:
-            pause_text = self.large_font.render('GAME PAUSED', True, self.colors["text"])
+            pause_text = self._text('GAME PAUSED', self.large_font)
             text_rect = pause_text.get_rect(center=(self.width//2, self.height//2))
             self.surface.blit(pause_text, text_rect)
             
-            resume_text = self.font.render('Press P to continue', True, self.colors["text"])
+            resume_text = self._text('Press P to continue', self.font)
             resume_rect = resume_text.get_rect(center=(self.width//2, self.height//2 + 60))
             self.surface.blit(resume_text, resume_rect)
         
         # If game is over, show game over information
         if self.game_over:
-            game_over_text = self.large_font.render('GAME OVER!', True, self.colors["text"])
+            game_over_text = self._text('GAME OVER!', self.large_font)
             text_rect = game_over_text.get_rect(center=(self.width//2, self.height//2))
             self.surface.blit(game_over_text, text_rect)
             
-            restart_text = self.font.render('Press R to restart', True, self.colors["text"])
+            restart_text = self._text('Press R to restart', self.font)
             restart_rect = restart_text.get_rect(center=(self.width//2, self.height//2 + 60))
             self.surface.blit(restart_text, restart_rect)
         
@@ -293,7 +492,8 @@ class SnakeGame:
         """
         Reset game state
         """
-        self.snake = [(self.width // 2, self.height // 2)]
+        self._init_body(self._start_position())
+        self._init_free_cells()
         self.direction = (1, 0)
         self.next_direction = (1, 0)
         self.food = self._generate_food()
@@ -301,4 +501,5 @@ class SnakeGame:
         self.game_over = False
         self.paused = False
         self.speed = 0.5  # Reset to lower initial speed
-        self.move_timer = 0 
\ No newline at end of file
+        self.move_timer = 0
+        self.dirty = True 
\ No newline at end of file
@@ -4,27 +4,138 @@ Gesture detector module - Implements hand tracking and gesture recognition
 
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
 import math
-from collections import Counter
+import os
+import threading
+import time
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Default hand landmarker model location (models/ in the project root)
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "models",
+    "hand_landmarker.task"
+)
+
+# Indices into the direction smoothing state array
+_STATE_POS = 0            # Next write position in the ring buffer
+_STATE_LEN = 1            # Number of filled entries in the ring buffer
+_STATE_LAST_RAW = 2       # Last raw direction index (-1 if none)
+_STATE_CHANGE_COUNT = 3   # Consecutive detections of the last raw direction
+_STATE_LAST = 4           # Smoothed direction index (-1 if none)
+
+
+def _smooth_direction(dx, dy, axes, buf, counts, state, threshold):
+    """
+    Pick the raw direction for a thumb-index vector and update the smoothed direction
+
+    Args:
+        dx (int): X component of the thumb-index vector
+        dy (int): Y component of the thumb-index vector
+        axes (numpy.ndarray): (4, 2) unit vectors of the directions
+        buf (numpy.ndarray): Ring buffer of recent raw direction indices
+        counts (numpy.ndarray): Votes per direction index in the ring buffer
+        state (numpy.ndarray): Smoothing state, see the _STATE_* indices
+        threshold (int): Consecutive detections needed to switch direction immediately
+
+    Returns:
+        int: Raw direction index
+    """
+    # Choose direction with smallest angle, i.e. largest dot product with the axis
+    raw = 0
+    best_dot = axes[0, 0] * dx + axes[0, 1] * dy
+    for i in range(1, axes.shape[0]):
+        dot = axes[i, 0] * dx + axes[i, 1] * dy
+        if dot > best_dot:
+            best_dot = dot
+            raw = i
+    
+    # Detect direction change
+    if raw != state[_STATE_LAST_RAW]:
+        state[_STATE_CHANGE_COUNT] = 1
+        state[_STATE_LAST_RAW] = raw
+    else:
+        state[_STATE_CHANGE_COUNT] += 1
+    
+    size = buf.shape[0]
+    if state[_STATE_CHANGE_COUNT] >= threshold and raw != state[_STATE_LAST]:
+        # Clear buffer and update direction immediately
+        buf[:] = raw
+        counts[:] = 0
+        counts[raw] = size
+        state[_STATE_POS] = 0
+        state[_STATE_LEN] = size
+        state[_STATE_LAST] = raw
+    else:
+        # Normal smoothing process - the oldest entry sits at the write position once full
+        if state[_STATE_LEN] == size:
+            counts[buf[state[_STATE_POS]]] -= 1
+        else:
+            state[_STATE_LEN] += 1
+        buf[state[_STATE_POS]] = raw
+        counts[raw] += 1
+        state[_STATE_POS] = (state[_STATE_POS] + 1) % size
+        
+        # Get most common direction in buffer, ties going to the oldest entry
+        best_count = counts.max()
+        start = (state[_STATE_POS] - state[_STATE_LEN]) % size
+        for k in range(state[_STATE_LEN]):
+            index = buf[(start + k) % size]
+            if counts[index] == best_count:
+                state[_STATE_LAST] = index
+                break
+    
+    return raw
+
+
+# Compile the numeric core when numba is available, otherwise run it as plain Python
+if njit is not None:
+    _smooth_direction = njit(cache=True)(_smooth_direction)
 
 
 class GestureDetector:
     """
     Hand gesture detector using MediaPipe
     """
-    def __init__(self):
+    def __init__(self, model_path=MODEL_PATH, use_gpu=True):
         """
         Initialize the gesture detector
+
+        Args:
+            model_path (str): Path to the MediaPipe hand landmarker model
+            use_gpu (bool): Whether to run the hand landmarker on the GPU delegate
         """
-        # Initialize MediaPipe Hands
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        
+        # Latest result state, shared with the hand landmarker callback thread
+        self.lock = threading.Lock()
+        self._frame_size = (0, 0)  # Size of the last submitted full-size frame
+        self._overlay = None  # (hand landmarks, thumb-index line) to draw
+        
+        # Prefer the Tasks API hand landmarker, which supports the GPU delegate
+        self.landmarker = None
+        self.hands = None
+        self._last_timestamp_ms = 0
+        if os.path.exists(model_path):
+            self.landmarker = self._create_landmarker(model_path, use_gpu)
+        else:
+            print(f"Hand landmarker model not found: {model_path}")
+            print("Falling back to the MediaPipe Hands solution on the CPU")
+            
+            # Initialize MediaPipe Hands
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=1,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
@@ -36,157 +147,262 @@ class GestureDetector:
             "LEFT": (-1, 0)    # Left direction (negative x-axis)
         }
         
+        # Axes as unit vectors - the smallest angle is simply the largest dot product
+        self._axes_names = list(self.axes)
+        self._axes_arr = np.array([self.axes[name] for name in self._axes_names], np.float32)
+        
         # Direction related variables
         self.last_direction = None
-        self.direction_buffer = []
         self.buffer_size = 3  # Reduced buffer size for better responsiveness
+        self.direction_buffer = np.zeros(self.buffer_size, np.int64)  # Ring buffer of recent raw direction indices
+        self.direction_counts = np.zeros(len(self._axes_names), np.int64)  # Votes per direction index in the buffer
         
         # Direction change detection
         self.last_raw_direction = None
         self.direction_change_count = 0
         self.direction_change_threshold = 3  # Threshold for consecutive detection of same new direction
         
+        # Smoothing state shared with the compiled direction core
+        self._direction_state = np.array([0, 0, -1, 0, -1], np.int64)
+
+        # Compile the direction core now rather than on the first detected hand, where it
+        # would run under the result lock and stall the video; copies keep the state untouched
+        _smooth_direction(
+            1, 0,
+            self._axes_arr,
+            self.direction_buffer.copy(),
+            self.direction_counts.copy(),
+            self._direction_state.copy(),
+            self.direction_change_threshold
+        )
+
         # Debug information
         self.debug_info = {}
         
         # Indicator position
         self.indicator_pos = None
+        
+        # Inference resolution - MediaPipe accuracy plateaus well below webcam resolution
+        self.inference_width = 320
+        self._small_frame = None  # Preallocated downscaled frame buffer, converted to RGB in place
+    
+    def _create_landmarker(self, model_path, use_gpu):
+        """
+        Create a Tasks API hand landmarker, falling back to the CPU if the GPU delegate fails
+
+        Args:
+            model_path (str): Path to the hand landmarker model
+            use_gpu (bool): Whether to try the GPU delegate first
+
+        Returns:
+            mediapipe.tasks.vision.HandLandmarker: Hand landmarker in live stream mode
+        """
+        base_options_cls = mp.tasks.BaseOptions
+        delegates = [base_options_cls.Delegate.CPU]
+        if use_gpu:
+            delegates.insert(0, base_options_cls.Delegate.GPU)
+        
+        for delegate in delegates:
+            options = mp.tasks.vision.HandLandmarkerOptions(
+                base_options=base_options_cls(model_asset_path=model_path, delegate=delegate),
+                running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
+                result_callback=self._on_result,
+                num_hands=1,
+                min_hand_detection_confidence=0.5,
+                min_hand_presence_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+            try:
+                return mp.tasks.vision.HandLandmarker.create_from_options(options)
+            except (RuntimeError, NotImplementedError) as e:
+                if delegate == delegates[-1]:
+                    raise
+                print(f"GPU delegate unavailable, using CPU: {e}")
+    
+    def _on_result(self, result, output_image, timestamp_ms):
+        """
+        Hand landmarker result callback, called on a MediaPipe thread
+
+        Args:
+            result (mediapipe.tasks.vision.HandLandmarkerResult): Detection result
+            output_image (mediapipe.Image): Image the result was computed on
+            timestamp_ms (int): Timestamp of the input image
+        """
+        # Convert to the landmark protos used by the drawing utilities
+        hands = [
+            landmark_pb2.NormalizedLandmarkList(landmark=[
+                landmark_pb2.NormalizedLandmark(x=point.x, y=point.y, z=point.z)
+                for point in hand
+            ])
+            for hand in result.hand_landmarks
+        ]
+        
+        with self.lock:
+            w, h = self._frame_size
+            self._update_direction(hands, w, h)
+    
+    def _update_direction(self, hands, w, h):
+        """
+        Update the direction, indicator position and overlay from detected hand landmarks
+
+        Args:
+            hands (list): NormalizedLandmarkList for each detected hand
+            w (int): Width of the full-size frame
+            h (int): Height of the full-size frame
+        """
+        # Reset indicator position
+        self.indicator_pos = None
+        self._overlay = None
+        
+        if not hands:
+            return
+        
+        hand_landmarks = hands[0]
+        
+        # Get thumb and index finger key points
+        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
+        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
+        
+        # Calculate thumb and index finger coordinates (pixel coordinates)
+        thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
+        index_x, index_y = int(index_tip.x * w), int(index_tip.y * h)
+        
+        # Calculate vector from thumb to index finger
+        line_vector = (index_x - thumb_x, index_y - thumb_y)
+        
+        # Calculate vector length
+        vector_length = math.sqrt(line_vector[0]**2 + line_vector[1]**2)
+        
+        # If vector length is too small, might be noise, keep previous direction
+        if vector_length < 10:
+            self._overlay = (hand_landmarks, None)
+            return
+        
+        # Choose and smooth the direction
+        raw_index = _smooth_direction(
+            line_vector[0],
+            line_vector[1],
+            self._axes_arr,
+            self.direction_buffer,
+            self.direction_counts,
+            self._direction_state,
+            self.direction_change_threshold
+        )
+        raw_direction = self._axes_names[raw_index]
+        self.last_raw_direction = raw_direction
+        self.direction_change_count = int(self._direction_state[_STATE_CHANGE_COUNT])
+        self.last_direction = self._axes_names[self._direction_state[_STATE_LAST]]
+        
+        # Set indicator position - at midpoint between thumb and index finger
+        center_x = (thumb_x + index_x) // 2
+        center_y = (thumb_y + index_y) // 2
+        self.indicator_pos = (center_x, center_y)
+        self._overlay = (hand_landmarks, ((thumb_x, thumb_y), (index_x, index_y)))
+        
+        # Save debug information
+        self.debug_info = {
+            "thumb": (thumb_x, thumb_y),
+            "index": (index_x, index_y),
+            "line_vector": line_vector,
+            "raw_direction": raw_direction,
+            "smoothed_direction": self.last_direction,
+            "change_count": self.direction_change_count
+        }
+    
+    def _draw_overlay(self, frame):
+        """
+        Draw the latest hand landmarks, thumb-index line and direction arrow
+
+        Args:
+            frame (numpy.ndarray): Frame to draw on
+        """
+        if self._overlay is None:
+            return
+        
+        hand_landmarks, line = self._overlay
+        
+        # Draw hand landmarks
+        self.mp_drawing.draw_landmarks(
+            frame, 
+            hand_landmarks, 
+            self.mp_hands.HAND_CONNECTIONS,
+            self.mp_drawing_styles.get_default_hand_landmarks_style(),
+            self.mp_drawing_styles.get_default_hand_connections_style()
+        )
+        
+        if line is None:
+            return
+        
+        # Draw thumb and index finger connection line
+        cv2.line(
+            frame,
+            line[0],
+            line[1],
+            (0, 255, 255),
+            2
+        )
+        
+        # Draw direction indicator arrow
+        if self.last_direction:
+            center_x, center_y = self.indicator_pos
+            axis_vector = self.axes[self.last_direction]
+            end_x = center_x + axis_vector[0] * 100
+            end_y = center_y + axis_vector[1] * 100
+            
+            cv2.arrowedLine(
+                frame,
+                (center_x, center_y),
+                (int(end_x), int(end_y)),
+                (0, 255, 0),
+                3
+            )
     
     def detect_direction(self, frame):
         """
         Detect hand gesture and determine direction based on the angle between thumb-index line and coordinate axes
 
+        With the hand landmarker, the frame is submitted asynchronously and the direction
+        and overlay come from the most recently completed result.
+
         Args:
             frame (numpy.ndarray): Input image frame
 
         Returns:
             str: Detected direction ('UP', 'RIGHT', 'DOWN', 'LEFT') or None if no hand detected
         """
-        # Convert to RGB format
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, _ = frame.shape
         
-        # Process image
-        results = self.hands.process(rgb_frame)
+        # Downscale to inference resolution, keeping the aspect ratio
+        small_w = self.inference_width
+        small_h = max(1, h * small_w // w)
+        if self._small_frame is None or self._small_frame.shape[:2] != (small_h, small_w):
+            self._small_frame = np.empty((small_h, small_w, 3), np.uint8)
+        cv2.resize(frame, (small_w, small_h), dst=self._small_frame, interpolation=cv2.INTER_LINEAR)
         
-        h, w, _ = frame.shape
+        # Convert to RGB format in place - landmarks are drawn on the full-size BGR frame,
+        # so the downscaled buffer is free to change channel order
+        cv2.cvtColor(self._small_frame, cv2.COLOR_BGR2RGB, dst=self._small_frame)
         
-        # Reset indicator position
-        self.indicator_pos = None
+        # Process image - landmarks are normalized, so they map back onto the full frame
+        if self.landmarker is None:
+            results = self.hands.process(self._small_frame)
+            with self.lock:
+                self._update_direction(results.multi_hand_landmarks or [], w, h)
+        else:
+            with self.lock:
+                self._frame_size = (w, h)
+            
+            # Live stream mode requires strictly increasing timestamps
+            timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            
+            # mp.Image copies the pixels, so the buffer can be reused for the next frame
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=self._small_frame)
+            self.landmarker.detect_async(mp_image, timestamp_ms)
         
-        # Draw hand landmarks
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame, 
-                    hand_landmarks, 
-                    self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                    self.mp_drawing_styles.get_default_hand_connections_style()
-                )
-                
-                # Get thumb and index finger key points
-                thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-                index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                
-                # Calculate thumb and index finger coordinates (pixel coordinates)
-                thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                index_x, index_y = int(index_tip.x * w), int(index_tip.y * h)
-                
-                # Calculate vector from thumb to index finger
-                line_vector = (index_x - thumb_x, index_y - thumb_y)
-                
-                # Calculate vector length
-                vector_length = math.sqrt(line_vector[0]**2 + line_vector[1]**2)
-                
-                # If vector length is too small, might be noise, use previous direction
-                if vector_length < 10:
-                    return self.last_direction
-                
-                # Calculate angles with each coordinate axis
-                angles = {}
-                for name, axis_vector in self.axes.items():
-                    # Calculate dot product
-                    dot_product = line_vector[0] * axis_vector[0] + line_vector[1] * axis_vector[1]
-                    # Calculate cosine of angle
-                    cos_angle = dot_product / (vector_length * math.sqrt(axis_vector[0]**2 + axis_vector[1]**2))
-                    # Prevent floating point precision issues
-                    cos_angle = max(-1, min(1, cos_angle))
-                    # Calculate angle (radians)
-                    angle = math.acos(cos_angle)
-                    # Store angle
-                    angles[name] = angle
-                
-                # Choose direction with smallest angle
-                raw_direction = min(angles, key=angles.get)
-                
-                # Detect direction change
-                if raw_direction != self.last_raw_direction:
-                    # Direction changed, reset count
-                    self.direction_change_count = 1
-                    self.last_raw_direction = raw_direction
-                else:
-                    # Direction unchanged, increment count
-                    self.direction_change_count += 1
-                
-                # If same new direction detected consecutively reaches threshold, update direction immediately
-                if self.direction_change_count >= self.direction_change_threshold and raw_direction != self.last_direction:
-                    # Clear buffer and update direction immediately
-                    self.direction_buffer = [raw_direction] * self.buffer_size
-                    self.last_direction = raw_direction
-                else:
-                    # Normal smoothing process
-                    self.direction_buffer.append(raw_direction)
-                    if len(self.direction_buffer) > self.buffer_size:
-                        self.direction_buffer.pop(0)
-                    
-                    # Get most common direction in buffer
-                    if self.direction_buffer:
-                        counter = Counter(self.direction_buffer)
-                        smoothed_direction = counter.most_common(1)[0][0]
-                        self.last_direction = smoothed_direction
-                
-                # Set indicator position - at midpoint between thumb and index finger
-                center_x = (thumb_x + index_x) // 2
-                center_y = (thumb_y + index_y) // 2
-                self.indicator_pos = (center_x, center_y)
-                
-                # Save debug information
-                self.debug_info = {
-                    "thumb": (thumb_x, thumb_y),
-                    "index": (index_x, index_y),
-                    "line_vector": line_vector,
-                    "angles": angles,
-                    "raw_direction": raw_direction,
-                    "smoothed_direction": self.last_direction,
-                    "change_count": self.direction_change_count
-                }
-                
-                # Draw thumb and index finger connection line
-                cv2.line(
-                    frame,
-                    (thumb_x, thumb_y),
-                    (index_x, index_y),
-                    (0, 255, 255),
-                    2
-                )
-                
-                # Draw direction indicator arrow
-                if self.last_direction:
-                    axis_vector = self.axes[self.last_direction]
-                    end_x = center_x + axis_vector[0] * 100
-                    end_y = center_y + axis_vector[1] * 100
-                    
-                    cv2.arrowedLine(
-                        frame,
-                        (center_x, center_y),
-                        (int(end_x), int(end_y)),
-                        (0, 255, 0),
-                        3
-                    )
-                
-                return self.last_direction
-        
-        return self.last_direction
+        with self.lock:
+            self._draw_overlay(frame)
+            return self.last_direction
     
     def get_indicator_position(self):
         """
@@ -201,4 +417,7 @@ class GestureDetector:
         """
         Release resources
         """
-        self.hands.close() 
\ No newline at end of file
+        if self.landmarker is not None:
+            self.landmarker.close()
+        if self.hands is not None:
+            self.hands.close() 
\ No newline at end of file
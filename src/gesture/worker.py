@@ -0,0 +1,92 @@
+"""
+Gesture worker module - Runs gesture detection on a background thread
+"""
+
+import queue
+import threading
+import traceback
+
+import cv2
+
+
+class GestureWorker(threading.Thread):
+    """
+    Background thread that runs the gesture detector on incoming camera frames
+    """
+    def __init__(self, detector, frame_queue):
+        """
+        Initialize the gesture worker
+
+        Args:
+            detector (GestureDetector): Detector used to process frames
+            frame_queue (queue.Queue): Queue of raw camera frames to process
+        """
+        super().__init__(daemon=True)
+
+        self.detector = detector
+        self.frame_queue = frame_queue
+
+        # Latest result - a single attribute assignment is atomic, so the
+        # render thread can read the direction without locking
+        self.latest_direction = None
+
+        # Latest annotated frame slot, shared with the render thread
+        self.frame = None
+        self.lock = threading.Lock()
+
+        # Worker state
+        self.running = False
+        self.failed = False
+
+    def start(self):
+        """
+        Start processing frames in the background
+        """
+        self.running = True
+        super().start()
+
+    def run(self):
+        """
+        Worker loop - detects the direction on each frame taken from the queue
+        """
+        while self.running:
+            try:
+                frame = self.frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Flip horizontally to create mirror effect
+            frame = cv2.flip(frame, 1)
+
+            # Detect gesture and get direction (landmarks are drawn onto the frame)
+            try:
+                self.latest_direction = self.detector.detect_direction(frame)
+            except Exception as e:
+                print(f"Error in gesture detection: {e}")
+                traceback.print_exc()
+                self.failed = True
+                self.running = False
+                break
+
+            with self.lock:
+                self.frame = frame
+
+    def read_latest(self):
+        """
+        Get the newest annotated frame
+
+        Returns:
+            numpy.ndarray: Latest processed frame, or None if no new frame is ready
+        """
+        with self.lock:
+            frame = self.frame
+            self.frame = None
+            return frame
+
+    def release(self):
+        """
+        Stop the worker thread
+        """
+        self.running = False
+        if self.is_alive():
+            self.join(timeout=1.0)
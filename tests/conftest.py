@@ -0,0 +1,13 @@
+"""
+Shared test setup - Makes the project importable and runs pygame headless
+"""
+
+import os
+import sys
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Run pygame without opening a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
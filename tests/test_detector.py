@@ -0,0 +1,97 @@
+"""
+Tests for the gesture direction smoothing
+"""
+
+import math
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from src.gesture import detector
+
+
+AXES = {
+    "UP": (0, -1),
+    "RIGHT": (1, 0),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0)
+}
+
+
+class CounterSmoother:
+    """
+    Direction smoothing as the detector did it with a list buffer and Counter
+    """
+    def __init__(self, buffer_size=3, threshold=3):
+        self.buffer_size = buffer_size
+        self.threshold = threshold
+        self.direction_buffer = []
+        self.last_raw_direction = None
+        self.direction_change_count = 0
+        self.last_direction = None
+
+    def update(self, dx, dy):
+        vector_length = math.sqrt(dx**2 + dy**2)
+        angles = {}
+        for name, axis_vector in AXES.items():
+            cos_angle = (dx * axis_vector[0] + dy * axis_vector[1]) / vector_length
+            angles[name] = math.acos(max(-1, min(1, cos_angle)))
+        raw_direction = min(angles, key=angles.get)
+
+        if raw_direction != self.last_raw_direction:
+            self.direction_change_count = 1
+            self.last_raw_direction = raw_direction
+        else:
+            self.direction_change_count += 1
+
+        if self.direction_change_count >= self.threshold and raw_direction != self.last_direction:
+            self.direction_buffer = [raw_direction] * self.buffer_size
+            self.last_direction = raw_direction
+        else:
+            self.direction_buffer.append(raw_direction)
+            if len(self.direction_buffer) > self.buffer_size:
+                self.direction_buffer.pop(0)
+            self.last_direction = Counter(self.direction_buffer).most_common(1)[0][0]
+
+        return raw_direction
+
+
+def smoothing_functions():
+    functions = [detector._smooth_direction]
+    if hasattr(detector._smooth_direction, "py_func"):
+        functions.append(detector._smooth_direction.py_func)
+    return functions
+
+
+@pytest.mark.parametrize("smooth", smoothing_functions())
+@pytest.mark.parametrize("buffer_size, threshold", [(3, 3), (5, 2), (4, 6)])
+def test_matches_counter_smoothing(smooth, buffer_size, threshold):
+    rng = random.Random(buffer_size * 10 + threshold)
+    names = list(AXES)
+    axes = np.array([AXES[name] for name in names], np.float32)
+    buf = np.zeros(buffer_size, np.int64)
+    counts = np.zeros(len(names), np.int64)
+    state = np.array([0, 0, -1, 0, -1], np.int64)
+    reference = CounterSmoother(buffer_size, threshold)
+
+    for _ in range(5000):
+        # Mostly hold a direction for a while, sometimes jitter, like a real hand
+        dx, dy = 0, 0
+        while math.hypot(dx, dy) < 10:
+            if rng.random() < 0.2:
+                dx, dy = rng.choice([(20, 20), (-15, 15), (12, -12), (-30, -30)])
+            else:
+                dx, dy = rng.randint(-200, 200), rng.randint(-200, 200)
+
+        raw = smooth(dx, dy, axes, buf, counts, state, threshold)
+        expected_raw = reference.update(dx, dy)
+
+        assert names[raw] == expected_raw
+        assert names[state[detector._STATE_LAST]] == reference.last_direction
+        assert state[detector._STATE_CHANGE_COUNT] == reference.direction_change_count
+        assert counts.tolist() == [reference.direction_buffer.count(name) for name in names]
@@ -0,0 +1,241 @@
+"""
+Tests for the snake game logic
+"""
+
+import random
+
+import pygame
+import pytest
+
+from src.game.snake import SnakeGame
+
+
+DIRECTIONS = ["UP", "RIGHT", "DOWN", "LEFT"]
+
+
+@pytest.fixture(autouse=True)
+def pygame_session():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def model_step(game, model, food):
+    """
+    Move a plain list snake the way the game did before the circular buffer
+
+    Args:
+        game (SnakeGame): Game after its update, providing direction and settings
+        model (list): (x, y) segments ordered from head to tail, updated in place
+        food (tuple): Food position before the update
+
+    Returns:
+        bool: False if the move ended the game
+    """
+    head_x, head_y = model[0]
+    dir_x, dir_y = game.direction
+    new_head = (head_x + dir_x * game.cell_size, head_y + dir_y * game.cell_size)
+    grid_width, grid_height = game.cols * game.cell_size, game.rows * game.cell_size
+
+    if game.wall_collision:
+        if not (0 <= new_head[0] < grid_width and 0 <= new_head[1] < grid_height):
+            return False
+    else:
+        new_head = (new_head[0] % grid_width, new_head[1] % grid_height)
+
+    if new_head in model:
+        return False
+
+    model.insert(0, new_head)
+    food_eaten = (
+        abs(new_head[0] // game.cell_size - food[0] // game.cell_size) <= game.food_proximity and
+        abs(new_head[1] // game.cell_size - food[1] // game.cell_size) <= game.food_proximity
+    )
+    if not food_eaten:
+        model.pop()
+    return True
+
+
+def check_cells(game):
+    """
+    Check the occupancy set and free cell list agree with the snake body
+    """
+    grid = {
+        (x * game.cell_size, y * game.cell_size)
+        for x in range(game.cols)
+        for y in range(game.rows)
+    }
+    snake = game.snake
+
+    assert len(snake) == len(set(snake))
+    assert game._snake_set == set(snake)
+    assert game._snake_set <= grid
+    assert len(game._free_cells) == len(set(game._free_cells))
+    assert set(game._free_cells) == grid - game._snake_set
+    assert all(game._free_cells[i] == cell for cell, i in game._free_index.items())
+    assert len(game._free_index) == len(game._free_cells)
+    if not game.game_over:
+        assert game.food not in game._snake_set
+
+
+@pytest.mark.parametrize("width, height", [(100, 100), (160, 120), (640, 720)])
+@pytest.mark.parametrize("wall_collision", [True, False])
+def test_body_matches_list_model(width, height, wall_collision):
+    random.seed(width * height + wall_collision)
+    rng = random.Random(width + height)
+
+    game = SnakeGame(width, height)
+    game.wall_collision = wall_collision
+    game.food_proximity = 0  # Grow only when the head reaches the food cell
+    game.move_delay = 0  # Move on every update
+    model = game.snake
+    moves = games = 0
+
+    while moves < 3000:
+        if rng.random() < 0.3:
+            game.change_direction(rng.choice(DIRECTIONS))
+
+        food = game.food
+        assert game.update()
+        expected_alive = model_step(game, model, food)
+        assert game.game_over != expected_alive
+
+        if game.game_over:
+            games += 1
+            game.reset()
+            game.move_delay = 0
+            model = game.snake
+        else:
+            moves += 1
+            assert game.snake == model
+            assert len(game.snake) == game.score + 1
+        check_cells(game)
+
+    assert games > 0
+
+
+def test_growth_fills_the_board():
+    random.seed(0)
+    game = SnakeGame(100, 100)
+    game.food_proximity = 5  # Every move eats, so the snake only grows
+    game.move_delay = 0
+
+    # Sweep the 5x5 board row by row, covering every cell exactly once
+    game._init_body((0, 0))
+    game._init_free_cells()
+    game.food = game._generate_food()
+    path = []
+    for row in range(game.rows):
+        path += ["RIGHT" if row % 2 == 0 else "LEFT"] * (game.cols - 1)
+        if row < game.rows - 1:
+            path.append("DOWN")
+
+    for direction in path:
+        game.change_direction(direction)
+        game.update()
+        check_cells(game)
+
+    assert len(game.snake) == game.cols * game.rows
+    assert game._free_cells == []
+    assert game.game_over
+
+
+
+def test_start_position_is_on_the_grid():
+    game = SnakeGame(640, 720)
+    head_x, head_y = game.snake[0]
+    assert head_x % game.cell_size == 0 and head_y % game.cell_size == 0
+    assert head_x < game.cols * game.cell_size and head_y < game.rows * game.cell_size
+    check_cells(game)
+
+
+def test_change_speed_clamps_and_marks_dirty():
+    game = SnakeGame(640, 720)
+    game.dirty = False
+    game.change_speed(10)
+    assert game.speed == 2.0 and game.dirty
+    game.change_speed(-10)
+    assert game.speed == 0.1
+
+
+def test_update_marks_dirty_only_when_the_snake_moves():
+    game = SnakeGame(640, 720)
+    game.render()
+    assert not game.dirty
+
+    # At 0.5x speed the snake moves on every tenth frame
+    changes = []
+    for _ in range(30):
+        changed = game.update()
+        assert game.dirty == changed
+        changes.append(changed)
+        if game.dirty:
+            game.render()
+            assert not game.dirty
+    assert changes.count(True) == 3
+
+    # Paused and finished games never change
+    game.toggle_pause()
+    game.render()
+    assert not any(game.update() for _ in range(30)) and not game.dirty
+    game.toggle_pause()
+
+    # Colliding with the wall ends the game and changes the screen once
+    game.render()
+    game.move_delay = 0
+    while not game.update():
+        pass
+    while not game.game_over:
+        assert game.update()
+    assert game.dirty
+    game.render()
+    assert not game.update() and not game.dirty
+
+
+def test_render_draws_snake_tiles():
+    game = SnakeGame(640, 720)
+    head_x, head_y = game.snake[0]
+    for i in range(1, 4):
+        game._push_head((head_x + i * game.cell_size, head_y))
+
+    surface = game.render()
+
+    center = game.cell_size // 2
+    segments = game.snake
+    assert surface.get_at((segments[0][0] + center, segments[0][1] + center))[:3] == game.colors["snake_head"]
+    for x, y in segments[1:]:
+        assert surface.get_at((x + center, y + center))[:3] == game.colors["snake_body"]
+
+
+def test_hud_redraws_only_when_a_value_changes():
+    game = SnakeGame(640, 720)
+    rendered = []
+    cached_text = game._text
+
+    def text(label, font):
+        rendered.append(label)
+        return cached_text(label, font)
+
+    game._text = text
+
+    game.render()
+    assert len(rendered) == 3
+
+    # Moving without eating leaves the HUD as it was
+    game.food_proximity = -1
+    game.move_delay = 0
+    game.update()
+    game.render()
+    assert len(rendered) == 3
+
+    game.score += 1
+    game.render()
+    assert len(rendered) == 6 and rendered[-3] == "Score: 1"
+
+    game.change_speed(0.1)
+    game.render()
+    assert len(rendered) == 9 and rendered[-2] == "Speed: 0.6x"
+
+    game.toggle_wall_collision()
+    game.render()
+    assert len(rendered) == 12 and rendered[-1] == "Wall Collision: Off"